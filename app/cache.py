@@ -1,32 +1,94 @@
 """In-memory LRU cache for vehicle ID to unit number mapping."""
-from typing import Optional
-from cachetools import LRUCache
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
 import asyncio
+import time
 
 
-class AsyncLRUCache:
-    """Thread-safe async LRU cache wrapper."""
-    
+class LRUCache:
+    """
+    LRU cache for use from a single asyncio event loop.
+
+    get/set never await, so coroutines cannot interleave inside them and no
+    lock is needed. Entries may carry a TTL (e.g. negative lookups); entries
+    without one live until evicted.
+    """
+
     def __init__(self, maxsize: int = 100):
         """Initialize the cache with a maximum size."""
-        self._cache: LRUCache[int, str] = LRUCache(maxsize=maxsize)
-        self._lock = asyncio.Lock()
-    
-    async def get(self, key: int) -> Optional[str]:
-        """Get a value from the cache."""
-        async with self._lock:
-            return self._cache.get(key)
-    
-    async def set(self, key: int, value: str) -> None:
-        """Set a value in the cache."""
-        async with self._lock:
-            self._cache[key] = value
-    
-    async def clear(self) -> None:
+        # key -> (value, monotonic expiry or None for no expiry)
+        self._data: "OrderedDict[int, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._maxsize = maxsize
+        # Pending fetches keyed by cache key, shared by concurrent callers
+        self._inflight: Dict[int, "asyncio.Future[str]"] = {}
+
+    def get(self, key: int) -> Optional[str]:
+        """
+        Get a value from the cache, marking it as most recently used.
+
+        Returns None on a miss; stored values are never None, so callers must
+        test `is None` rather than truthiness (an empty unit number is a hit).
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: int, value: str, ttl: Optional[float] = None) -> None:
+        """
+        Set a value in the cache, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Seconds until the entry expires, or None to keep it until evicted
+        """
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        if len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    async def get_or_fetch(self, key: int, fetch: Callable[[], Awaitable[str]]) -> str:
+        """
+        Get a value from the cache, or run fetch() once for all concurrent callers.
+
+        Callers that miss while a fetch for the same key is pending await that
+        fetch instead of starting a duplicate one. fetch() is responsible for
+        populating the cache.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            # Run the fetch as its own task so no single caller owns it
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._fetch_done(key, t))
+
+        # Shield so a cancelled caller does not cancel the shared fetch;
+        # fetch errors reach every caller unchanged
+        return await asyncio.shield(task)
+
+    def _fetch_done(self, key: int, task: "asyncio.Future[str]") -> None:
+        """Drop a finished fetch from the in-flight map."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def clear(self) -> None:
         """Clear all entries from the cache."""
-        async with self._lock:
-            self._cache.clear()
+        self._data.clear()
 
 
 # Global cache instance for vehicle unit numbers
-vehicle_cache = AsyncLRUCache(maxsize=100)
+vehicle_cache = LRUCache(maxsize=100)
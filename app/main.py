@@ -1,12 +1,13 @@
 """FastAPI application main module."""
-import json
+import asyncio
 import logging
 import os
 from datetime import datetime, timezone
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import orjson
 from fastapi import FastAPI, Request, BackgroundTasks, Depends, HTTPException, status
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 
 from sqlalchemy import desc, select
@@ -15,7 +16,7 @@ from app.config import settings
 from app.database import async_session_maker
 from app.models import Event, SafetyEvent, SpeedingEvent
 from app.security import verify_webhook_signature
-from app.services import fetch_speeding_details, get_vehicle_unit
+from app.services import close_client, fetch_speeding_details, get_vehicle_unit, init_client
 from app.telegram_bot import init_bot, process_alert, process_safety_alert, close_bot
 
 # Configure logging
@@ -25,6 +26,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Quoted action values; a payload containing neither cannot hold a qualifying event
+_HANDLED_ACTION_MARKERS = (b'"speeding_event_created"', b'"safety_event_created"')
+
 
 def _extract_location(raw: dict) -> Tuple[Optional[float], Optional[float]]:
     """Best-effort extraction of lat/lon from Motive payload."""
@@ -95,6 +99,44 @@ def _normalize_safety_event_type(raw: dict) -> str:
     return "safety" if s else "safety"
 
 
+async def _prefetch_vehicle_units(events_raw: List[Any]) -> Dict[int, str]:
+    """Resolve unit numbers for every vehicle in a batch concurrently, once per vehicle."""
+    vehicle_ids = set()
+    for raw in events_raw:
+        if not isinstance(raw, dict):
+            continue
+        if raw.get("action") not in ("speeding_event_created", "safety_event_created"):
+            continue
+        try:
+            vehicle_ids.add(int(raw["vehicle_id"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    ids = list(vehicle_ids)
+    units = await asyncio.gather(*(get_vehicle_unit(vid) for vid in ids))
+    return dict(zip(ids, units))
+
+
+async def _process_alert_batch(alerts: List[Tuple[SpeedingEvent, str, Optional[str]]]) -> None:
+    """Send speeding alerts for a webhook batch concurrently."""
+    # return_exceptions: one failed alert (already logged) must not cancel the rest
+    await asyncio.gather(
+        *(process_alert(event, unit, map_link) for event, unit, map_link in alerts),
+        return_exceptions=True,
+    )
+
+
+def _ignored_response() -> ORJSONResponse:
+    """200 OK response for payloads without qualifying events."""
+    return ORJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "status": "ignored",
+            "reason": "No qualifying events (speeding_event_created / safety_event_created) in payload",
+        },
+    )
+
+
 def _verify_dashboard_auth(credentials: HTTPBasicCredentials = Depends(HTTPBasic())) -> None:
     """Require admin/tnisafety for dashboard and /api/events."""
     if credentials.username != "admin" or credentials.password != "tnisafety":
@@ -104,13 +146,15 @@ def _verify_dashboard_auth(credentials: HTTPBasicCredentials = Depends(HTTPBasic
 app = FastAPI(
     title="Safety Alert Bot",
     description="Webhook receiver for Motive speeding events with Telegram notifications",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on application startup."""
+    await init_client()
     await init_bot()
 
 
@@ -118,6 +162,7 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup services on application shutdown."""
     await close_bot()
+    await close_client()
 
 
 @app.get("/")
@@ -185,10 +230,15 @@ async def motive_webhook(
         signature = request.headers.get("X-KT-Webhook-Signature", "")
         verify_webhook_signature(body_bytes, signature, settings.webhook_secret)
         
-        # Step 3: Parse the request body
+        # Step 3: Skip parsing entirely when no handled action appears in the raw bytes
+        if not any(marker in body_bytes for marker in _HANDLED_ACTION_MARKERS):
+            logger.info("Event ignored: no handled action in payload")
+            return _ignored_response()
+
+        # Step 4: Parse the request body
         try:
-            payload: Union[List[Any], Any] = json.loads(body_bytes)
-        except json.JSONDecodeError:
+            payload: Union[List[Any], Any] = orjson.loads(body_bytes)
+        except orjson.JSONDecodeError:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid JSON payload"
@@ -197,7 +247,7 @@ async def motive_webhook(
         # Normalize to a list of event dicts
         if isinstance(payload, list):
             events_raw: List[Any] = payload
-            logger.info(f"Webhook batch received with {len(events_raw)} events")
+            logger.info("Webhook batch received with %s events", len(events_raw))
         else:
             events_raw = [payload]
             logger.info(
@@ -207,13 +257,17 @@ async def motive_webhook(
             )
 
         accepted_events: List[int] = []
+        speeding_alerts: List[Tuple[SpeedingEvent, str, Optional[str]]] = []
+
+        # Look up each distinct vehicle once, concurrently, before walking the batch
+        vehicle_units = await _prefetch_vehicle_units(events_raw)
 
         # Open a DB session for this batch
         async with async_session_maker() as session:
             # Process each event in the batch
             for raw in events_raw:
                 if not isinstance(raw, dict):
-                    logger.error(f"Skipping non-object event payload: {raw!r}")
+                    logger.error("Skipping non-object event payload: %r", raw)
                     continue
 
                 action = raw.get("action")
@@ -223,7 +277,7 @@ async def motive_webhook(
                     try:
                         event = SpeedingEvent.model_validate(raw)
                     except Exception as e:
-                        logger.error(f"Invalid payload structure for event: {e}")
+                        logger.error("Invalid payload structure for event: %s", e)
                         continue
 
                     event_id = event.id
@@ -240,7 +294,9 @@ async def motive_webhook(
 
                     map_link = _build_map_link(lat, lon)
                     vehicle_id_for_unit = vid if vid is not None else event.vehicle_id
-                    vehicle_unit = await get_vehicle_unit(vehicle_id_for_unit)
+                    vehicle_unit = vehicle_units.get(vehicle_id_for_unit)
+                    if vehicle_unit is None:
+                        vehicle_unit = await get_vehicle_unit(vehicle_id_for_unit)
                     event_ts = _extract_timestamp(raw) or datetime.now(timezone.utc)
 
                     try:
@@ -257,18 +313,17 @@ async def motive_webhook(
                         session.add(db_event)
                         await session.flush()
                     except Exception as e:
-                        logger.error(f"Failed to persist event {event_id} to DB: {e}", exc_info=True)
+                        logger.error("Failed to persist event %s to DB: %s", event_id, e, exc_info=True)
                         continue
 
-                    raw["vehicle_unit"] = vehicle_unit
-                    raw["map_link"] = map_link
-                    raw["lat"] = lat
-                    raw["lon"] = lon
+                    # Hand the already-validated model to the alert task (API values win)
+                    updates = {}
                     if speed is not None:
-                        raw["max_vehicle_speed"] = speed
+                        updates["max_vehicle_speed"] = speed
                     if limit is not None:
-                        raw["max_posted_speed_limit_in_kph"] = limit
-                    background_tasks.add_task(process_alert, raw)
+                        updates["max_posted_speed_limit_in_kph"] = limit
+                    alert_event = event.model_copy(update=updates) if updates else event
+                    speeding_alerts.append((alert_event, vehicle_unit, map_link))
                     accepted_events.append(event_id)
 
                 elif action == "safety_event_created":
@@ -276,12 +331,14 @@ async def motive_webhook(
                     try:
                         safety = SafetyEvent.model_validate(raw)
                     except Exception as e:
-                        logger.error(f"Invalid safety event payload: {e}")
+                        logger.error("Invalid safety event payload: %s", e)
                         continue
 
                     lat, lon = _extract_location(raw)  # start_location
                     map_link = _build_map_link(lat, lon)
-                    vehicle_unit = await get_vehicle_unit(safety.vehicle_id)
+                    vehicle_unit = vehicle_units.get(safety.vehicle_id)
+                    if vehicle_unit is None:
+                        vehicle_unit = await get_vehicle_unit(safety.vehicle_id)
                     event_ts = _extract_timestamp(raw) or datetime.now(timezone.utc)
                     event_type = _normalize_safety_event_type(raw)
 
@@ -299,7 +356,7 @@ async def motive_webhook(
                         session.add(db_event)
                         await session.flush()
                     except Exception as e:
-                        logger.error(f"Failed to persist safety event to DB: {e}", exc_info=True)
+                        logger.error("Failed to persist safety event to DB: %s", e, exc_info=True)
                         continue
 
                     raw["vehicle_unit"] = vehicle_unit
@@ -311,25 +368,23 @@ async def motive_webhook(
                     accepted_events.append(safety.id or 0)
 
                 else:
-                    logger.info(f"Event ignored: action '{action}' not processed")
+                    logger.info("Event ignored: action '%s' not processed", action)
                     continue
 
             # Commit all persisted events
             await session.commit()
 
-        # Step 4: Return 200 OK immediately (within 2 seconds constraint)
+        # Send all speeding alerts of the batch from a single background task
+        if speeding_alerts:
+            background_tasks.add_task(_process_alert_batch, speeding_alerts)
+
+        # Step 5: Return 200 OK immediately (within 2 seconds constraint)
         if not accepted_events:
             # No events were accepted, but we still return 200 to Motive
-            return JSONResponse(
-                status_code=status.HTTP_200_OK,
-                content={
-                    "status": "ignored",
-                    "reason": "No qualifying events (speeding_event_created / safety_event_created) in payload",
-                },
-            )
+            return _ignored_response()
 
-        logger.info(f"Events queued for processing: {accepted_events}")
-        return JSONResponse(
+        logger.info("Events queued for processing: %s", accepted_events)
+        return ORJSONResponse(
             status_code=status.HTTP_200_OK,
             content={
                 "status": "accepted",
@@ -341,14 +396,14 @@ async def motive_webhook(
     except HTTPException:
         # Re-raise HTTP exceptions (like 403 from signature verification)
         raise
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid JSON payload"
         )
     except Exception as e:
         # Log unexpected errors
-        logger.error(f"Unexpected error processing webhook: {e}", exc_info=True)
+        logger.error("Unexpected error processing webhook: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
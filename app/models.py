@@ -12,28 +12,23 @@ class SpeedingEvent(BaseModel):
     
     action: str = Field(..., description="Event action type")
     id: int = Field(..., description="Event ID")
-    max_over_speed_in_kph: float = Field(..., alias="max_over_speed_in_kph", description="Maximum speed over limit in KPH")
-    max_posted_speed_limit_in_kph: float = Field(..., alias="max_posted_speed_limit_in_kph", description="Maximum posted speed limit in KPH")
-    max_vehicle_speed: float = Field(..., alias="max_vehicle_speed", description="Maximum vehicle speed in KPH")
-    driver_id: int = Field(..., alias="driver_id", description="Driver ID")
-    vehicle_id: int = Field(..., alias="vehicle_id", description="Vehicle ID")
+    max_over_speed_in_kph: float = Field(..., description="Maximum speed over limit in KPH")
+    max_posted_speed_limit_in_kph: float = Field(..., description="Maximum posted speed limit in KPH")
+    max_vehicle_speed: float = Field(..., description="Maximum vehicle speed in KPH")
+    driver_id: int = Field(..., description="Driver ID")
+    vehicle_id: int = Field(..., description="Vehicle ID")
     status: Optional[str] = Field(default=None, description="Event status")
-    
-    model_config = {
-        "populate_by_name": True,
-    }
 
 
 class SafetyEvent(BaseModel):
     """Model for Motive safety_event_created payload (hard braking, acceleration, cornering)."""
     
     action: str = Field(..., description="Event action type")
-    vehicle_id: int = Field(..., alias="vehicle_id", description="Vehicle ID")
+    vehicle_id: int = Field(..., description="Vehicle ID")
     id: Optional[int] = Field(default=None, description="Event ID")
-    driver_id: Optional[int] = Field(default=None, alias="driver_id", description="Driver ID")
+    driver_id: Optional[int] = Field(default=None, description="Driver ID")
     
     model_config = {
-        "populate_by_name": True,
         "extra": "allow",
     }
 
@@ -31,6 +31,10 @@ def verify_webhook_signature(
             detail=f"Missing {signature_header} header"
         )
     
+    # Accept an optional "sha1=" scheme prefix on the header value
+    if signature.startswith("sha1="):
+        signature = signature[5:]
+
     # Compute expected signature using HMAC-SHA1
     expected_signature = hmac.new(
         secret.encode('utf-8'),
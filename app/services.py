@@ -2,7 +2,8 @@
 import logging
 from typing import Any, Dict, Optional
 import asyncio
-import httpx
+import aiohttp
+import orjson
 
 from app.cache import vehicle_cache
 from app.config import settings
@@ -14,36 +15,86 @@ MOTIVE_HEADERS = {
     "Accept": "application/json",
 }
 
+# Shared Motive API session (initialized on startup, reused for keep-alive connections)
+_session: Optional[aiohttp.ClientSession] = None
+
+# Seconds to cache "Unit Unknown" after a failed vehicle lookup (404/auth errors)
+NEGATIVE_CACHE_TTL = 60.0
+
+# Attempts for fetch_speeding_details; 404s back off 0.25s, 0.5s between tries.
+SPEEDING_DETAILS_ATTEMPTS = 3
+
+
+async def init_client() -> aiohttp.ClientSession:
+    """Initialize the shared Motive API HTTP session."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            headers=MOTIVE_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=10),
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=30),
+        )
+    return _session
+
+
+async def get_client() -> aiohttp.ClientSession:
+    """Return the shared Motive API session, initializing it if needed."""
+    if _session is None or _session.closed:
+        return await init_client()
+    return _session
+
+
+async def close_client() -> None:
+    """Close the shared Motive API HTTP session."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """Decode a Motive API response body with orjson (bypasses the client's str decode + stdlib json)."""
+    return orjson.loads(await response.read())
+
 
 async def fetch_speeding_details(event_id: int) -> Optional[Dict[str, Any]]:
     """
     Fetch speeding event details from Motive API (API-first source of truth for location).
     GET https://api.gomotive.com/v1/speeding_events/{event_id}
     Returns dict with lat, lon, speed, limit, vehicle_id (or None on error).
-    Added a 5-second delay to prevent 404 race conditions.
+    Retries 404s with a short exponential backoff, since the webhook can arrive
+    before the event is readable from the API.
     """
-    await asyncio.sleep(5) 
-
     url = f"https://api.gomotive.com/v1/speeding_events/{event_id}"
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, headers=MOTIVE_HEADERS)
-            response.raise_for_status()
-            data = response.json()
-    except httpx.HTTPStatusError as e:
-        logger.warning(f"Speeding details API error for event_id={event_id}: {e.response.status_code}")
-        return None
-    except httpx.RequestError as e:
-        logger.warning(f"Speeding details request error for event_id={event_id}: {e}")
-        return None
-    except Exception as e:
-        logger.warning(f"Speeding details error for event_id={event_id}: {e}")
+    data: Optional[Dict[str, Any]] = None
+    for attempt in range(SPEEDING_DETAILS_ATTEMPTS):
+        try:
+            session = await get_client()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                data = await _read_json(response)
+            break
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404 and attempt < SPEEDING_DETAILS_ATTEMPTS - 1:
+                await asyncio.sleep(0.25 * (2 ** attempt))
+                continue
+            logger.warning("Speeding details API error for event_id=%s: %s", event_id, e.status)
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("Speeding details request error for event_id=%s: %s", event_id, e)
+            return None
+        except Exception as e:
+            logger.warning("Speeding details error for event_id=%s: %s", event_id, e)
+            return None
+
+    if not isinstance(data, dict):
+        logger.debug("Motive speeding_events response is not an object: %s", data)
         return None
 
     # Normalize: API may return { "speeding_event": { ... } } or top-level keys
     event = data.get("speeding_event") if isinstance(data.get("speeding_event"), dict) else data
     if not isinstance(event, dict):
-        logger.debug(f"Motive speeding_events response missing event object: {data}")
+        logger.debug("Motive speeding_events response missing event object: %s", data)
         return None
 
     lat: Optional[float] = None
@@ -101,54 +152,66 @@ async def get_vehicle_unit(vehicle_id: int) -> str:
         The vehicle unit number (from the 'number' field), or "Unit Unknown" on error
     """
     # Check cache first
-    cached_unit = await vehicle_cache.get(vehicle_id)
-    if cached_unit:
-        logger.info(f"Cache hit for vehicle_id={vehicle_id}, unit={cached_unit}")
+    cached_unit = vehicle_cache.get(vehicle_id)
+    if cached_unit is not None:
+        logger.info("Cache hit for vehicle_id=%s, unit=%s", vehicle_id, cached_unit)
         return cached_unit
     
-    logger.info(f"Cache miss for vehicle_id={vehicle_id}, fetching from API")
-    
+    logger.info("Cache miss for vehicle_id=%s, fetching from API", vehicle_id)
+
+    # Concurrent misses for the same vehicle share a single API request
+    return await vehicle_cache.get_or_fetch(vehicle_id, lambda: _fetch_vehicle_unit(vehicle_id))
+
+
+async def _fetch_vehicle_unit(vehicle_id: int) -> str:
+    """Fetch a vehicle unit number from the Motive API and cache it."""
     # Fetch from Motive API
     try:
         url = f"https://api.gomotive.com/v1/vehicles/{vehicle_id}"
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, headers=MOTIVE_HEADERS)
+        session = await get_client()
+        async with session.get(url) as response:
             response.raise_for_status()
-            
             # Motive wraps the vehicle in a 'vehicle' key; extract nested number.
-            vehicle_data = response.json()
-            unit_number = vehicle_data.get("vehicle", {}).get("number")
+            vehicle_data = await _read_json(response)
 
-            if not unit_number:
-                # Log full payload at debug level to inspect structure in Railway logs.
-                logger.debug(f"Motive Response: {vehicle_data}")
-                unit_number = "Unit Unknown"
-            
-            # Cache the result (keyed by vehicle_id, so repeated lookups are avoided)
-            await vehicle_cache.set(vehicle_id, unit_number)
-            logger.info(f"Fetched and cached vehicle_id={vehicle_id}, unit={unit_number}")
-            
-            return unit_number
-            
-    except httpx.HTTPStatusError as e:
-        status_code = e.response.status_code
+        unit_number = vehicle_data.get("vehicle", {}).get("number")
+
+        ttl: Optional[float] = None
+        if not unit_number:
+            # Log full payload at debug level to inspect structure in Railway logs.
+            logger.debug("Motive Response: %s", vehicle_data)
+            unit_number = "Unit Unknown"
+            ttl = NEGATIVE_CACHE_TTL
+
+        # Cache the result (keyed by vehicle_id, so repeated lookups are avoided)
+        vehicle_cache.set(vehicle_id, unit_number, ttl=ttl)
+        logger.info("Fetched and cached vehicle_id=%s, unit=%s", vehicle_id, unit_number)
+
+        return unit_number
+
+    except aiohttp.ClientResponseError as e:
+        status_code = e.status
         if status_code in (401, 403):
-            logger.error(f"Auth error fetching vehicle {vehicle_id}: {status_code} {e}")
-            # Do not raise — return safe fallback
-            return "Unit Unknown"
+            logger.error("Auth error fetching vehicle %s: %s %s", vehicle_id, status_code, e)
+            # Do not raise — return safe fallback, briefly cached so an auth blip
+            # does not turn every event into an API call
+            unit_number = "Unit Unknown"
+            vehicle_cache.set(vehicle_id, unit_number, ttl=NEGATIVE_CACHE_TTL)
+            return unit_number
         if status_code == 404:
-            logger.warning(f"Vehicle not found: vehicle_id={vehicle_id}")
+            logger.warning("Vehicle not found: vehicle_id=%s", vehicle_id)
             unit_number = "Unit Unknown"
-            # Cache the "not found" result to avoid repeated API calls
-            await vehicle_cache.set(vehicle_id, unit_number)
+            # Cache the "not found" result briefly to avoid repeated API calls
+            # without pinning a transiently missing vehicle forever
+            vehicle_cache.set(vehicle_id, unit_number, ttl=NEGATIVE_CACHE_TTL)
             return unit_number
-        logger.error(f"HTTP error fetching vehicle {vehicle_id}: {e}")
+        logger.error("HTTP error fetching vehicle %s: %s", vehicle_id, e)
         return "Unit Unknown"
             
-    except httpx.RequestError as e:
-        logger.error(f"Request error fetching vehicle {vehicle_id}: {e}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error("Request error fetching vehicle %s: %s", vehicle_id, e)
         return "Unit Unknown"
         
     except Exception as e:
-        logger.error(f"Unexpected error fetching vehicle {vehicle_id}: {e}")
+        logger.error("Unexpected error fetching vehicle %s: %s", vehicle_id, e)
         return "Unit Unknown"
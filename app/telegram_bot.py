@@ -1,4 +1,5 @@
 """Telegram bot integration using Aiogram 3.x."""
+import asyncio
 import logging
 from aiogram import Bot
 from typing import Optional
@@ -12,6 +13,21 @@ logger = logging.getLogger(__name__)
 # Global bot instance (will be initialized in main)
 bot: Optional[Bot] = None
 
+# Caps concurrently running alert tasks so webhook bursts cannot fan out unbounded
+_alert_semaphore = asyncio.Semaphore(settings.alert_concurrency)
+
+_KPH_TO_MPH = 0.621371
+
+# Speeding alert message (HTML); the map line is appended only when available
+_MSG_TEMPLATE = (
+    "🚨 <b>SPEEDING ALERT</b>\n"
+    "<b>Unit:</b> {unit}\n"
+    "<b>Route Limit:</b> {limit:.1f} mph\n"
+    "<b>Current Speed:</b> {speed:.1f} mph\n"
+    "<b>Violation:</b> +{over:.1f} mph"
+)
+_MAP_LINE_TEMPLATE = "\n<b>Map:</b> {map_link}"
+
 
 async def init_bot() -> Bot:
     """Initialize the Telegram bot."""
@@ -31,116 +47,116 @@ async def close_bot() -> None:
 
 def kph_to_mph(kph: float) -> float:
     """Convert kilometers per hour to miles per hour."""
-    return kph * 0.621371
+    return kph * _KPH_TO_MPH
 
 
-async def process_alert(event_data: dict) -> None:
+async def process_alert(
+    event: SpeedingEvent,
+    unit_number: Optional[str] = None,
+    map_link: Optional[str] = None,
+) -> None:
     """
     Process a speeding alert event and send Telegram notification if threshold met.
     
     Args:
-        event_data: The speeding event data dictionary
+        event: The validated speeding event
+        unit_number: Vehicle unit number already resolved by the webhook, if any
+        map_link: Google Maps link for the event location, if any
     """
-    try:
-        logger.info(f"Processing alert event: {event_data.get('id')}")
-        
-        # Initialize bot if not already done
-        if bot is None:
-            await init_bot()
+    async with _alert_semaphore:
+        try:
+            logger.info("Processing alert event: %s", event.id)
         
-        # Parse the event
-        event = SpeedingEvent.model_validate(event_data)
+            # Initialize bot if not already done
+            if bot is None:
+                await init_bot()
         
-        # Convert speeds to MPH
-        limit_mph = kph_to_mph(event.max_posted_speed_limit_in_kph)
-        speed_mph = kph_to_mph(event.max_vehicle_speed)
-        over_mph = kph_to_mph(event.max_over_speed_in_kph)
+            # Convert speeds to MPH
+            limit_mph = kph_to_mph(event.max_posted_speed_limit_in_kph)
+            speed_mph = kph_to_mph(event.max_vehicle_speed)
+            over_mph = kph_to_mph(event.max_over_speed_in_kph)
         
-        # Safety filter: Only send if over_speed_mph >= 5 (prevents spam for minor fluctuations)
-        if over_mph < 5:
-            logger.info(f"Event {event.id} filtered: over_speed_mph={over_mph:.1f} < 5 mph threshold")
-            return
+            # Safety filter: Only send if over_speed_mph >= 5 (prevents spam for minor fluctuations)
+            if over_mph < 5:
+                logger.info("Event %s filtered: over_speed_mph=%.1f < 5 mph threshold", event.id, over_mph)
+                return
         
-        # Get vehicle unit number (prefer value from enriched payload to avoid duplicate API calls)
-        unit_number = event_data.get("vehicle_unit")
-        if not unit_number:
-            unit_number = await get_vehicle_unit(event.vehicle_id)
-
-        # Fallback: if unit is unknown, include raw vehicle_id
-        if unit_number == "Unit Unknown":
-            unit_display = f"Unknown (ID: {event.vehicle_id})"
-        else:
-            unit_display = unit_number
+            # Get vehicle unit number (prefer value resolved by the webhook to avoid duplicate API calls)
+            if unit_number is None:
+                unit_number = await get_vehicle_unit(event.vehicle_id)
+
+            # Fallback: if unit is unknown, include raw vehicle_id
+            if unit_number == "Unit Unknown":
+                unit_display = f"Unknown (ID: {event.vehicle_id})"
+            else:
+                unit_display = unit_number
         
-        # Format the alert message using HTML
-        message_lines = [
-            "🚨 <b>SPEEDING ALERT</b>",
-            f"<b>Unit:</b> {unit_display}",
-            f"<b>Route Limit:</b> {limit_mph:.1f} mph",
-            f"<b>Current Speed:</b> {speed_mph:.1f} mph",
-            f"<b>Violation:</b> +{over_mph:.1f} mph",
-        ]
-
-        # Include map link if present
-        map_link = event_data.get("map_link")
-        if map_link:
-            message_lines.append(f"<b>Map:</b> {map_link}")
-
-        message = "\n".join(message_lines)
+            # Format the alert message using HTML
+            message = _MSG_TEMPLATE.format(
+                unit=unit_display,
+                limit=limit_mph,
+                speed=speed_mph,
+                over=over_mph,
+            )
+
+            # Include map link if present
+            if map_link:
+                message += _MAP_LINE_TEMPLATE.format(map_link=map_link)
         
-        # Send the message
-        await bot.send_message(
-            chat_id=settings.telegram_chat_id,
-            text=message,
-            parse_mode="HTML"
-        )
+            # Send the message
+            await bot.send_message(
+                chat_id=settings.telegram_chat_id,
+                text=message,
+                parse_mode="HTML"
+            )
         
-        logger.info(f"Telegram alert sent for event {event.id}, unit {unit_number}")
+            logger.info("Telegram alert sent for event %s, unit %s", event.id, unit_number)
         
-    except Exception as e:
-        logger.error(f"Error processing alert: {e}", exc_info=True)
-        raise
+        except Exception as e:
+            logger.error("Error processing alert: %s", e, exc_info=True)
+            raise
 
 
 async def process_safety_alert(event_data: dict) -> None:
     """
     Process a safety event (hard brake, acceleration, cornering) and send Telegram notification.
     """
-    try:
-        logger.info(f"Processing safety alert: {event_data.get('event_type')}, id={event_data.get('id')}")
-        if bot is None:
-            await init_bot()
-
-        vehicle_id = event_data.get("vehicle_id")
-        unit_number = event_data.get("vehicle_unit")
-        if not unit_number and vehicle_id is not None:
-            from app.services import get_vehicle_unit
-            unit_number = await get_vehicle_unit(vehicle_id)
-
-        if unit_number == "Unit Unknown" and vehicle_id is not None:
-            unit_display = f"Unknown (ID: {vehicle_id})"
-        else:
-            unit_display = unit_number or "Unknown"
-
-        event_type = event_data.get("event_type", "safety")
-        event_label = event_type.replace("_", " ").title()
-
-        message_lines = [
-            "⚠️ <b>SAFETY EVENT</b>",
-            f"<b>Type:</b> {event_label}",
-            f"<b>Unit:</b> {unit_display}",
-        ]
-        map_link = event_data.get("map_link")
-        if map_link:
-            message_lines.append(f"<b>Map:</b> {map_link}")
-
-        message = "\n".join(message_lines)
-        await bot.send_message(
-            chat_id=settings.telegram_chat_id,
-            text=message,
-            parse_mode="HTML",
-        )
-        logger.info(f"Safety alert sent: {event_type}, unit {unit_display}")
-    except Exception as e:
-        logger.error(f"Error processing safety alert: {e}", exc_info=True)
-        raise
+    async with _alert_semaphore:
+        try:
+            logger.info("Processing safety alert: %s, id=%s", event_data.get("event_type"), event_data.get("id"))
+            if bot is None:
+                await init_bot()
+
+            vehicle_id = event_data.get("vehicle_id")
+            unit_number = event_data.get("vehicle_unit")
+            if unit_number is None and vehicle_id is not None:
+                from app.services import get_vehicle_unit
+                unit_number = await get_vehicle_unit(vehicle_id)
+
+            if unit_number == "Unit Unknown" and vehicle_id is not None:
+                unit_display = f"Unknown (ID: {vehicle_id})"
+            else:
+                unit_display = unit_number or "Unknown"
+
+            event_type = event_data.get("event_type", "safety")
+            event_label = event_type.replace("_", " ").title()
+
+            message_lines = [
+                "⚠️ <b>SAFETY EVENT</b>",
+                f"<b>Type:</b> {event_label}",
+                f"<b>Unit:</b> {unit_display}",
+            ]
+            map_link = event_data.get("map_link")
+            if map_link:
+                message_lines.append(f"<b>Map:</b> {map_link}")
+
+            message = "\n".join(message_lines)
+            await bot.send_message(
+                chat_id=settings.telegram_chat_id,
+                text=message,
+                parse_mode="HTML",
+            )
+            logger.info("Safety alert sent: %s, unit %s", event_type, unit_display)
+        except Exception as e:
+            logger.error("Error processing safety alert: %s", e, exc_info=True)
+            raise
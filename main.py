@@ -7,5 +7,7 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.host,
         port=settings.port,
+        loop="uvloop",
+        http="httptools",
         reload=True  # Set to False in production
     )